@@ -90,19 +90,19 @@ class EMA:
         """Convert a number sequence back to pattern names."""
         return ', '.join(self.number_to_name[num] for num in sequence)
     
-    def add_block(self, block):
-        """Add a block to the system."""
+    def _ingest_block(self, block):
+        """Record a block in the containers without updating the frequency table."""
         sequence = self.block_to_sequence(block)
         if not sequence:
-            return
-        
+            return False
+
         # Store block
         self.all_blocks.append(block)
         self.current_block_index = len(self.all_blocks) - 1
-        
+
         # Add to recent blocks (deque automatically maintains maxlen)
         self.recent_blocks.append(sequence)
-        
+
         # Track single tools from this block (maintain recency order)
         # Extract tool names from block
         tool_names = [name.strip() for name in block.split(',') if name.strip()]
@@ -112,19 +112,43 @@ class EMA:
                 self.recent_single_tools.remove(tool_name)
             # Add to end (most recent)
             self.recent_single_tools.append(tool_name)
-        
+
         # Generate subsequences from this block
         subsequences = self.generate_subsequences(sequence)
-        
+
         # Track subsequences from recent k blocks
         self.recent_subsequences.append(subsequences)
-        
+        return True
+
+    def add_block(self, block):
+        """Add a block to the system."""
+        if not self._ingest_block(block):
+            return
+
         # Update frequency table (for subsequences outside recent k)
         self._update_frequency_table()
-        
+
         # Evict entries if frequency table exceeds max size t
         if len(self.frequency_table) > self.t:
             self._evict_from_frequency_table()
+
+    def add_blocks(self, blocks):
+        """Add many blocks at once.
+
+        Per-block bookkeeping matches add_block, but the frequency table
+        (whose rebuild rescans every stored block) is updated a single time
+        after the whole batch instead of once per block.
+        """
+        added = False
+        for block in blocks:
+            added = self._ingest_block(block) or added
+        if not added:
+            return
+
+        self._update_frequency_table()
+
+        if len(self.frequency_table) > self.t:
+            self._evict_from_frequency_table()
     
     def _update_frequency_table(self):
         """Update frequency table for all subsequences across all blocks (entire time)."""
@@ -3,7 +3,7 @@ import os
 import json
 import re
 import anthropic
-from typing import Dict, Any, List, Optional, TypedDict, Annotated
+from typing import Dict, Any, List, Optional, Set, TypedDict, Annotated
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
 from langsmith import traceable
@@ -25,6 +25,7 @@ class AgentState(TypedDict):
     validation_feedback: Optional[str]  # Feedback from validation node
     planning_iterations: int  # Track how many times we've planned
     available_tools: Optional[List[Dict[str, Any]]]  # List of available tools with schemas
+    available_tools_index: Optional[Dict[str, Dict[str, Any]]]  # Tools keyed by name for O(1) lookup
     plan_from_tool_names: bool  # Whether plan was created directly from tool names
 
 
@@ -72,6 +73,9 @@ class LangGraphAgent:
         # Check if tools are already fetched
         if state.get("available_tools"):
             print("✓ Tools already fetched, using cached tools")
+            # Rebuild the name index if it's missing (e.g., state restored externally)
+            if not state.get("available_tools_index"):
+                state["available_tools_index"] = self._index_tools(state["available_tools"])
             return state
         
         print("Fetching available tools from MCP server...")
@@ -135,6 +139,7 @@ class LangGraphAgent:
                         if tools and isinstance(tools, list) and len(tools) > 0:
                             print(f"First tool example: {json.dumps(tools[0], indent=2)[:200]}...")
                         state["available_tools"] = tools
+                        state["available_tools_index"] = self._index_tools(tools)
                         print(f"✓ Fetched {len(tools)} tools")
                         return state
                     except json.JSONDecodeError as e:
@@ -150,6 +155,7 @@ class LangGraphAgent:
                 tools = self._parse_tools_from_text(text_content)
                 if tools:
                     state["available_tools"] = tools
+                    state["available_tools_index"] = self._index_tools(tools)
                     print(f"✓ Extracted {len(tools)} tools from text response")
                     return state
             
@@ -174,6 +180,7 @@ class LangGraphAgent:
             print(f"Found {tool_use_count} tool_use blocks")
             if tools:
                 state["available_tools"] = tools
+                state["available_tools_index"] = self._index_tools(tools)
                 print(f"✓ Extracted {len(tools)} tools from response")
                 return state
             
@@ -183,12 +190,19 @@ class LangGraphAgent:
             for i, block in enumerate(response.content):
                 print(f"  Block {i}: type={getattr(block, 'type', 'N/A')}, has_text={hasattr(block, 'text')}, has_name={hasattr(block, 'name')}")
             state["available_tools"] = []
-            
+            state["available_tools_index"] = {}
+
         except Exception as e:
             print(f"Warning: Failed to fetch tools: {e}. Continuing without tool list.")
             state["available_tools"] = []
-        
+            state["available_tools_index"] = {}
+
         return state
+
+    @staticmethod
+    def _index_tools(tools: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Build a name -> tool mapping for O(1) lookups (list order is preserved separately)."""
+        return {tool["name"]: tool for tool in tools if tool.get("name")}
     
     def _parse_tools_from_text(self, text_content: str) -> List[Dict[str, Any]]:
         """Parse tool names and descriptions from text format.
@@ -419,27 +433,23 @@ class LangGraphAgent:
         
         return []
     
-    def _create_plan_from_tool_names(self, tool_names: List[str], command: str, feedback: Optional[str], available_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _create_plan_from_tool_names(self, tool_names: List[str], command: str, feedback: Optional[str], tools_map: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Create a plan directly from tool names, using feedback to customize arguments.
-        
+
         Args:
             tool_names: List of full tool names (with "zapier_" prefix) as returned by _detect_tool_names_in_command
             command: The original command
             feedback: User feedback/context
-            available_tools: List of available tool schemas
+            tools_map: Mapping of tool name -> tool schema (see _index_tools)
         """
         if not tool_names:
             return []
-        
+
         # Combine command and feedback for context
         context = command
         if feedback:
             context = f"{command}\n\nFeedback: {feedback}"
         
-        # Create a mapping of tool names to tool schemas
-        # Note: tool_names already include "zapier_" prefix, so they match available_tools
-        tools_map = {tool.get("name"): tool for tool in available_tools if tool.get("name")}
-        
         # Build prompt to extract tool arguments from context
         tools_info = ""
         for i, tool_name in enumerate(tool_names, 1):
@@ -543,20 +553,31 @@ Important:
                 })
             return plan
     
-    def _format_tools_for_prompt(self, tools: List[Dict[str, Any]]) -> str:
-        """Format tools list into a readable string for prompts."""
+    def _format_tools_for_prompt(self, tools: List[Dict[str, Any]], focus: Optional[Set[str]] = None) -> str:
+        """Format tools list into a readable string for prompts.
+
+        When focus is given, only tools whose names are in it get full
+        parameter schemas; the rest of the catalog is emitted as a one-line
+        "name: description" index. This keeps validation prompts small even
+        for catalogs with thousands of tools.
+        """
         if not tools:
             return "No tools available."
-        
+
         formatted = "Available Tools:\n"
         for i, tool in enumerate(tools, 1):
             name = tool.get("name", "Unknown")
             description = tool.get("description", "No description")
             input_schema = tool.get("inputSchema", {})
-            
+
+            # Outside the focus set, a one-line index entry is enough
+            if focus is not None and name not in focus:
+                formatted += f"{i}. {name}: {description}\n"
+                continue
+
             formatted += f"\n{i}. {name}\n"
             formatted += f"   Description: {description}\n"
-            
+
             # Add input schema info
             if input_schema:
                 properties = input_schema.get("properties", {})
@@ -772,14 +793,15 @@ Guidelines:
         feedback = state.get("feedback")
         app = state.get("app")
         available_tools = state.get("available_tools", [])
-        
+        tools_index = state.get("available_tools_index") or self._index_tools(available_tools)
+
         # Check if command contains tool names (only on first iteration, not replanning)
         if iteration == 1 and not validation_feedback:
             detected_tools = self._detect_tool_names_in_command(command, available_tools)
             if detected_tools:
                 print(f"✓ Detected tool names in command: {', '.join(detected_tools)}")
                 print("Creating direct plan from tool names...")
-                plan = self._create_plan_from_tool_names(detected_tools, command, feedback, available_tools)
+                plan = self._create_plan_from_tool_names(detected_tools, command, feedback, tools_index)
                 state["plan"] = plan
                 state["planning_iterations"] = iteration
                 state["plan_from_tool_names"] = True
@@ -919,6 +941,39 @@ Plan steps for: "{command}"
         # Also check for tool result blocks in the response
         # The MCP response might have tool results embedded
         return tool_results
+
+    @staticmethod
+    def _scan_json_object(text: str) -> Optional[tuple]:
+        """Linearly scan for the first balanced {...} span in text.
+
+        Returns (start, end) slice indices or None. One O(n) pass instead of
+        regex backtracking, and the caller can feed the validated span
+        straight into json.loads without rescanning.
+        """
+        start = text.find('{')
+        if start == -1:
+            return None
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    return (start, i + 1)
+        return None
     
     def _extract_structured_output(self, response) -> Optional[Dict[str, Any]]:
         """Extract structured output from MCP tool response."""
@@ -945,7 +1000,7 @@ Plan steps for: "{command}"
                                 # Prefer larger/more complete JSON objects
                                 if not structured_output or len(str(parsed)) > len(str(structured_output)):
                                     structured_output = parsed
-                        except:
+                        except (json.JSONDecodeError, ValueError):
                             continue
                 
                 # Check for tool_result blocks (MCP tool results)
@@ -959,18 +1014,27 @@ Plan steps for: "{command}"
                                     if isinstance(parsed, dict):
                                         structured_output = parsed
                                         break
-                                except:
+                                except (json.JSONDecodeError, ValueError):
                                     pass
                     elif isinstance(content, str):
                         try:
                             parsed = json.loads(content)
                             if isinstance(parsed, dict):
                                 structured_output = parsed
-                        except:
+                        except (json.JSONDecodeError, ValueError):
                             pass
         
         return structured_output
     
+    @staticmethod
+    def _execution_token_budget(step: Dict[str, Any], has_tool: bool) -> int:
+        """Adaptive max_tokens for a step: simple steps get a small budget,
+        complex ones keep the full cap. Generation cost scales with the
+        budget, so this trims latency and spend on short steps."""
+        est_complexity = len(step.get("description", "")) // 20 + (4 if has_tool else 0)
+        cap = 2000 if has_tool else 500
+        return min(cap, 200 + 50 * est_complexity)
+
     @traceable(name="execute_step")
     def execute_step(self, step: Dict[str, Any], state: AgentState) -> Dict[str, Any]:
         """Execute a single step using the MCP tools."""
@@ -1063,7 +1127,7 @@ Summary: [brief description of what this step accomplishes]
                 # Use beta API with tools for steps that require tool execution
                 response = self.client.beta.messages.create(
                     model="claude-3-5-haiku-20241022",
-                    max_tokens=2000,
+                    max_tokens=self._execution_token_budget(step, has_tool=True),
                     system=system_prompt,
                     messages=[
                         {"role": "user", "content": execution_prompt}
@@ -1075,7 +1139,7 @@ Summary: [brief description of what this step accomplishes]
                 # Use regular API without tools for steps that don't require tool execution
                 response = self.client.messages.create(
                     model="claude-3-5-haiku-20241022",
-                    max_tokens=500,
+                    max_tokens=self._execution_token_budget(step, has_tool=False),
                     system=system_prompt,
                     messages=[
                         {"role": "user", "content": execution_prompt}
@@ -1095,15 +1159,15 @@ Summary: [brief description of what this step accomplishes]
                 structured_output = self._extract_structured_output(response)
                 
                 # If we found structured output, also try to extract it from the text as fallback
-                if not structured_output and result_text:
-                    # Look for JSON in the text (more comprehensive search)
-                    json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', result_text, re.DOTALL)
-                    if json_match:
+                # Cheap membership check short-circuits before any scanning
+                if not structured_output and result_text and '{' in result_text:
+                    span = self._scan_json_object(result_text)
+                    if span:
                         try:
-                            parsed = json.loads(json_match.group())
+                            parsed = json.loads(result_text[span[0]:span[1]])
                             if isinstance(parsed, dict) and len(parsed) > 0:
                                 structured_output = parsed
-                        except:
+                        except (json.JSONDecodeError, ValueError):
                             pass
             
             # Store both summary and structured output
@@ -1143,7 +1207,20 @@ Summary: [brief description of what this step accomplishes]
             state["validation_feedback"] = None
             print("✓ Tool-name-based plan validated")
             return state
-        
+
+        # Local preflight: catch unknown tool names without an LLM round-trip
+        tools_index = state.get("available_tools_index")
+        if tools_index:
+            unknown = [s["tool_name"] for s in plan
+                       if s.get("tool_name") and s["tool_name"] not in tools_index]
+            if unknown:
+                state["validation_feedback"] = (
+                    f"These tool names do not match any available tool: {', '.join(unknown)}. "
+                    "Use exact tool names from the available tools list."
+                )
+                print(f"⚠ Preflight validation: unknown tool names: {', '.join(unknown)}")
+                return state
+
         # Get system prompt with app context and planning mode restrictions
         system_prompt = self._get_system_prompt(app, planning_mode=True)
         
@@ -1157,10 +1234,12 @@ Summary: [brief description of what this step accomplishes]
         if feedback:
             user_input = f"Command: {command}\nAdditional feedback: {feedback}"
         
-        # Get available tools from state
+        # Get available tools from state; only tools referenced by the plan
+        # need full schemas, the rest are listed as a one-line index
         available_tools = state.get("available_tools", [])
-        tools_info = self._format_tools_for_prompt(available_tools)
-        
+        focus = {s.get("tool_name") for s in plan if s.get("tool_name")}
+        tools_info = self._format_tools_for_prompt(available_tools, focus=focus)
+
         validation_prompt = f"""Review this plan for: "{user_input}"
 
 Plan:
@@ -1197,7 +1276,9 @@ ISSUES FOUND:
             # Use regular messages API (no MCP) since we're providing tools in the prompt
             response = self.client.messages.create(
                 model="claude-3-5-haiku-20241022",
-                max_tokens=1500,
+                # Scale the budget with plan size: small plans need far fewer
+                # tokens to enumerate issues than the worst-case 1500
+                max_tokens=min(1500, 200 + 120 * len(plan)),
                 system=system_prompt,
                 messages=[
                     {"role": "user", "content": validation_prompt}
@@ -1335,6 +1416,7 @@ ISSUES FOUND:
             "validation_feedback": None,
             "planning_iterations": 0,
             "available_tools": None,  # Will be fetched in fetch_tools node
+            "available_tools_index": None,  # Built alongside available_tools in fetch_tools
             "plan_from_tool_names": False  # Will be set to True if plan is created from tool names
         }
         
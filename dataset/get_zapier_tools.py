@@ -1,13 +1,96 @@
 """Script to fetch all tools from Zapier MCP API."""
 import os
 import json
+import random
+import textwrap
+import time
+from collections import defaultdict
+from operator import itemgetter
+import threading
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import anthropic
 from dotenv import load_dotenv
 from typing import Dict, Any, List, Optional
 
+try:
+    # Optional: stream-parse large JSON-RPC bodies instead of buffering them
+    import ijson
+    from ijson.common import ObjectBuilder
+    _HAS_IJSON = True
+except ImportError:
+    _HAS_IJSON = False
+
 load_dotenv()
 
+# Shared session so the TLS handshake to mcp.zapier.com is paid once and the
+# connection is reused across method attempts and repeated invocations.
+# Retries here cover connection setup only: HTTP-level and JSON-RPC
+# transient failures are owned by _try_method's backoff loop, so the two
+# layers never stack multiplicatively.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=None,
+        connect=3,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.5,
+    ),
+))
+
+# Explicit retry policy for failures urllib3 cannot see (connection resets,
+# transient JSON-RPC errors delivered inside 200 responses)
+_MAX_TRANSIENT_RETRIES = 2
+_BACKOFF_MULTIPLIER = 0.5
+_BACKOFF_JITTER = 0.25
+
+# JSON-RPC "method not found" - retrying the same method cannot help
+_JSONRPC_METHOD_NOT_FOUND = -32601
+
+DEBUG = os.environ.get("MOUSETRON_DEBUG") == "1"
+
+# Process-lifetime Anthropic client so the TLS connection to
+# api.anthropic.com survives across calls (the client is thread-safe)
+_anthropic_client: Optional[anthropic.Anthropic] = None
+_anthropic_lock = threading.Lock()
+
+
+def _get_anthropic_client(api_key: str) -> anthropic.Anthropic:
+    """Return the shared Anthropic client, creating it on first use."""
+    global _anthropic_client
+    if _anthropic_client is None:
+        with _anthropic_lock:
+            if _anthropic_client is None:
+                _anthropic_client = anthropic.Anthropic(
+                    api_key=api_key,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(max_keepalive_connections=4, max_connections=10),
+                        timeout=60,
+                    ),
+                )
+    return _anthropic_client
+
+
+def _truncated_repr(obj: Any, n: int = 300) -> str:
+    """Cheap shape summary of a response without serializing the whole object."""
+    if isinstance(obj, dict):
+        shape = ", ".join(
+            f"{key}: {type(obj[key]).__name__}" for key in list(obj.keys())[:5]
+        )
+        summary = f"dict({len(obj)} keys: {shape})"
+    elif isinstance(obj, list):
+        summary = f"list({len(obj)} items)"
+    else:
+        summary = repr(obj)
+    return summary[:n]
+
 
 def get_zapier_tools(authorization_token: str = None) -> List[Dict[str, Any]]:
     """
@@ -51,142 +134,294 @@ def get_zapier_tools(authorization_token: str = None) -> List[Dict[str, Any]]:
     
     print(f"Fetching tools from Zapier MCP API...")
     print(f"Endpoint: {mcp_url}")
-    
-    # Try each method until one works
+
+    # Probe all methods concurrently and take the first success: latency is
+    # max(RTT) instead of sum(RTT) when the working method isn't first.
+    # The executor is shut down without waiting so a win returns
+    # immediately instead of joining the losing probes' retry loops.
     last_error = None
-    for method in methods_to_try:
-        print(f"\nTrying method: {method}")
-        
-        # MCP uses JSON-RPC protocol
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": {}
+    executor = ThreadPoolExecutor(max_workers=len(methods_to_try))
+    try:
+        futures = {
+            executor.submit(_try_method, _SESSION, mcp_url, headers, method): method
+            for method in methods_to_try
         }
-    
-        try:
-            response = requests.post(
-                mcp_url,
-                json=payload,
-                headers=headers,
-                timeout=30,
-                stream=True  # Enable streaming for SSE
-            )
-            
-            # Print response details for debugging
-            print(f"  Status Code: {response.status_code}")
-            print(f"  Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
-            
-            if response.status_code != 200:
-                error_text = response.text[:300] if hasattr(response, 'text') else str(response.content[:300])
-                print(f"  Error Response: {error_text}")
-                last_error = f"HTTP {response.status_code}: {error_text[:200]}"
+        for future in as_completed(futures):
+            method = futures[future]
+            tools, error = future.result()
+            if tools:
+                print(f"  ✓ Success! Method '{method}' found {len(tools)} tools")
+                return tools
+            last_error = error
+            print(f"  Method '{method}' failed: {error}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # If all methods failed
+    raise Exception(f"All methods failed. Last error: {last_error}")
+
+
+def _iter_sse_events(response, chunk_size=4096):
+    """Yield (event_type, data) tuples from a streaming SSE response.
+
+    Raw bytes are accumulated across iter_content() chunks so lines and
+    events that straddle HTTP chunk boundaries are reassembled correctly
+    (iter_lines silently depends on newlines landing inside one chunk).
+    An event is dispatched on its blank-line terminator and multi-line
+    "data:" fields are concatenated per the SSE spec; the event type is
+    kept as per-stream state between reads.
+    """
+    buf = bytearray()
+    event_type = None
+    data_lines = []
+    scan_from = 0
+
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if not chunk:
+            continue
+        buf += chunk
+        while True:
+            newline = buf.find(b'\n', scan_from)
+            if newline == -1:
+                # No complete line yet; remember where to resume scanning
+                scan_from = len(buf)
+                break
+            line = bytes(buf[:newline]).rstrip(b'\r')
+            del buf[:newline + 1]
+            scan_from = 0
+
+            if not line:
+                # Blank line terminates the current event
+                if data_lines:
+                    yield event_type, '\n'.join(data_lines)
+                event_type = None
+                data_lines = []
                 continue
-            
-            # Check if response is SSE (text/event-stream) or JSON
-            content_type = response.headers.get('Content-Type', '')
-            
-            if 'text/event-stream' in content_type or 'event-stream' in content_type:
-                # Handle SSE response
-                print(f"  Detected SSE stream, parsing...")
-                result = None
-                for line in response.iter_lines(decode_unicode=True):
-                    if line.startswith('data: '):
-                        data_str = line[6:]  # Remove 'data: ' prefix
-                        if data_str.strip():
-                            try:
-                                event_data = json.loads(data_str)
-                                # Look for the final result
-                                if "result" in event_data:
-                                    result = event_data
-                                    break
-                                elif "error" in event_data:
-                                    error_msg = event_data["error"]
-                                    if isinstance(error_msg, dict):
-                                        error_msg = f"{error_msg.get('code', 'Unknown')}: {error_msg.get('message', 'Unknown error')}"
-                                    print(f"  JSON-RPC Error in SSE: {error_msg}")
-                                    last_error = f"JSON-RPC Error: {error_msg}"
-                                    result = None
-                                    break
-                            except json.JSONDecodeError:
-                                continue
-                
-                if not result:
-                    last_error = "No valid JSON-RPC response in SSE stream"
+            if line.startswith(b':'):
+                continue  # SSE comment line
+
+            field, _, value = line.partition(b':')
+            if value.startswith(b' '):
+                value = value[1:]
+            if field == b'data':
+                data_lines.append(value.decode('utf-8', errors='replace'))
+            elif field == b'event':
+                event_type = value.decode('utf-8', errors='replace')
+
+    # Flush a trailing event that wasn't blank-line terminated
+    if data_lines:
+        yield event_type, '\n'.join(data_lines)
+
+
+# Tool-array locations probed in the response (Structure 1/2/3 below)
+_TOOL_ARRAY_PREFIXES = frozenset((
+    "result.tools.item",
+    "result.items.item",
+    "tools.item",
+    "result.item",
+))
+
+
+def _stream_tools(raw):
+    """Single-pass streaming extraction from a JSON-RPC body. Requires ijson.
+
+    Returns (tools, rpc_error). Objects under any of the known tool-array
+    paths are collected as they are parsed, so peak memory is one tool
+    instead of the whole multi-MB payload plus its parsed copy; a top-level
+    "error" member is captured in the same pass.
+    """
+    tools = []
+    rpc_error = None
+    builder = None
+    capture_prefix = None
+    for prefix, event, value in ijson.parse(raw):
+        if builder is not None:
+            builder.event(event, value)
+            if event == 'end_map' and prefix == capture_prefix:
+                if capture_prefix == 'error':
+                    rpc_error = builder.value
+                else:
+                    tools.append(builder.value)
+                builder = None
+            continue
+        if event == 'start_map' and (prefix in _TOOL_ARRAY_PREFIXES or prefix == 'error'):
+            builder = ObjectBuilder()
+            builder.event(event, value)
+            capture_prefix = prefix
+        elif prefix == 'error' and event in ('string', 'number'):
+            rpc_error = value
+    return tools, rpc_error
+
+
+def _is_transient_jsonrpc_error(error):
+    """Server-side JSON-RPC errors are worth retrying; "method not found" is not."""
+    code = error.get("code") if isinstance(error, dict) else None
+    return isinstance(code, int) and code != _JSONRPC_METHOD_NOT_FOUND and -32099 <= code <= -32000
+
+
+def _try_method(session, mcp_url, headers, method):
+    """Attempt one JSON-RPC method with bounded backoff on transient failures.
+
+    Returns a (tools, error) tuple: tools is a non-empty list on success,
+    otherwise None with a human-readable error description. Transient
+    failures (connection resets, server-side JSON-RPC errors) are retried
+    with exponential backoff plus jitter; permanent ones like "method not
+    found" fail immediately.
+    """
+    tools = error = None
+    for attempt in range(_MAX_TRANSIENT_RETRIES + 1):
+        tools, error, transient = _attempt_method(session, mcp_url, headers, method)
+        if tools or not transient or attempt == _MAX_TRANSIENT_RETRIES:
+            break
+        delay = max(0.0, _BACKOFF_MULTIPLIER * (2 ** attempt)
+                    + random.uniform(-_BACKOFF_JITTER, _BACKOFF_JITTER))
+        print(f"  [{method}] Transient failure ({error}); retrying in {delay:.2f}s")
+        time.sleep(delay)
+    return tools, error
+
+
+def _attempt_method(session, mcp_url, headers, method):
+    """Single attempt of one JSON-RPC method.
+
+    Returns (tools, error, transient) where transient marks failures that
+    may succeed on retry.
+    """
+    # MCP uses JSON-RPC protocol
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": method,
+        "params": {}
+    }
+
+    try:
+        response = session.post(
+            mcp_url,
+            json=payload,
+            headers=headers,
+            timeout=30,
+            stream=True  # Enable streaming for SSE
+        )
+
+        # Print response details for debugging
+        print(f"  [{method}] Status Code: {response.status_code}")
+        print(f"  [{method}] Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
+
+        if response.status_code != 200:
+            error_text = response.text[:300] if hasattr(response, 'text') else str(response.content[:300])
+            # Rate limits and server errors are transient; the session's
+            # urllib3 Retry deliberately ignores statuses, so the backoff
+            # for these happens here and nowhere else
+            transient = response.status_code == 429 or response.status_code >= 500
+            return None, f"HTTP {response.status_code}: {error_text[:200]}", transient
+
+        # Check if response is SSE (text/event-stream) or JSON
+        content_type = response.headers.get('Content-Type', '')
+
+        if 'text/event-stream' in content_type or 'event-stream' in content_type:
+            # Handle SSE response
+            print(f"  [{method}] Detected SSE stream, parsing...")
+            result = None
+            for _event_type, data_str in _iter_sse_events(response):
+                if not data_str.strip():
                     continue
-            else:
-                # Handle regular JSON response
                 try:
-                    result = response.json()
+                    event_data = json.loads(data_str)
                 except json.JSONDecodeError:
-                    # Try to parse as text first
-                    text = response.text
-                    print(f"  Response text (first 500 chars): {text[:500]}")
-                    last_error = "Response is not valid JSON"
                     continue
-            
-            # Check for JSON-RPC errors
-            if result and "error" in result:
-                error_msg = result["error"]
-                if isinstance(error_msg, dict):
-                    error_msg = f"{error_msg.get('code', 'Unknown')}: {error_msg.get('message', 'Unknown error')}"
-                print(f"  JSON-RPC Error: {error_msg}")
-                last_error = f"JSON-RPC Error: {error_msg}"
-                continue
-            
+                # Look for the final result
+                if "result" in event_data:
+                    result = event_data
+                    # Stop reading before the server finishes streaming and
+                    # release the connection back to the pool
+                    response.close()
+                    break
+                elif "error" in event_data:
+                    rpc_error = event_data["error"]
+                    error_msg = rpc_error
+                    if isinstance(rpc_error, dict):
+                        error_msg = f"{rpc_error.get('code', 'Unknown')}: {rpc_error.get('message', 'Unknown error')}"
+                    return None, f"JSON-RPC Error: {error_msg}", _is_transient_jsonrpc_error(rpc_error)
+
             if not result:
-                last_error = "No result in response"
-                continue
-            
-            # Extract tools from response - try multiple possible structures
-            tools = []
-            
-            # Structure 1: result.tools
-            if "result" in result:
-                result_data = result["result"]
-                if isinstance(result_data, dict):
-                    if "tools" in result_data:
-                        tools = result_data["tools"]
-                    elif "items" in result_data:
-                        tools = result_data["items"]
-                elif isinstance(result_data, list):
-                    tools = result_data
-            
-            # Structure 2: direct tools array
-            if not tools and "tools" in result:
-                tools = result["tools"]
-            
-            # Structure 3: check if result itself is the tools array
-            if not tools and isinstance(result.get("result"), list):
-                tools = result["result"]
-            
+                return None, "No valid JSON-RPC response in SSE stream", True
+        elif _HAS_IJSON:
+            # Stream-parse the body: tools and a possible JSON-RPC error are
+            # extracted in one pass without buffering the full payload
+            response.raw.decode_content = True
+            try:
+                tools, rpc_error = _stream_tools(response.raw)
+            except ijson.JSONError:
+                return None, "Response is not valid JSON", False
+            if rpc_error is not None:
+                error_msg = rpc_error
+                if isinstance(rpc_error, dict):
+                    error_msg = f"{rpc_error.get('code', 'Unknown')}: {rpc_error.get('message', 'Unknown error')}"
+                return None, f"JSON-RPC Error: {error_msg}", _is_transient_jsonrpc_error(rpc_error)
             if tools:
-                print(f"  ✓ Success! Found {len(tools)} tools")
-                return tools
-            else:
-                print(f"  ⚠ No tools found in response structure")
-                print(f"  Response structure: {json.dumps(result, indent=2)[:300]}...")
-                last_error = "No tools found in response"
-                
-        except requests.exceptions.HTTPError as e:
-            error_detail = ""
-            if hasattr(e.response, 'text'):
-                error_detail = f": {e.response.text[:200]}"
-            last_error = f"HTTP Error {e.response.status_code}{error_detail}"
-            print(f"  {last_error}")
-            continue
-        except requests.exceptions.RequestException as e:
-            last_error = f"Request Exception: {e}"
-            print(f"  {last_error}")
-            continue
-        except json.JSONDecodeError as e:
-            last_error = f"JSON Decode Error: {e}"
-            print(f"  {last_error}")
-            continue
-    
-    # If all methods failed
-    raise Exception(f"All methods failed. Last error: {last_error}")
+                return tools, None, False
+            print(f"  [{method}] ⚠ No tools found in streamed response")
+            return None, "No tools found in response", False
+        else:
+            # Handle regular JSON response
+            try:
+                result = response.json()
+            except json.JSONDecodeError:
+                # Try to parse as text first
+                text = response.text
+                print(f"  [{method}] Response text (first 500 chars): {text[:500]}")
+                return None, "Response is not valid JSON", False
+
+        # Check for JSON-RPC errors
+        if result and "error" in result:
+            rpc_error = result["error"]
+            error_msg = rpc_error
+            if isinstance(rpc_error, dict):
+                error_msg = f"{rpc_error.get('code', 'Unknown')}: {rpc_error.get('message', 'Unknown error')}"
+            return None, f"JSON-RPC Error: {error_msg}", _is_transient_jsonrpc_error(rpc_error)
+
+        if not result:
+            return None, "No result in response", False
+
+        # Extract tools from response - try multiple possible structures
+        tools = []
+
+        # Structure 1: result.tools
+        if "result" in result:
+            result_data = result["result"]
+            if isinstance(result_data, dict):
+                if "tools" in result_data:
+                    tools = result_data["tools"]
+                elif "items" in result_data:
+                    tools = result_data["items"]
+            elif isinstance(result_data, list):
+                tools = result_data
+
+        # Structure 2: direct tools array
+        if not tools and "tools" in result:
+            tools = result["tools"]
+
+        # Structure 3: check if result itself is the tools array
+        if not tools and isinstance(result.get("result"), list):
+            tools = result["result"]
+
+        if tools:
+            return tools, None, False
+
+        print(f"  [{method}] ⚠ No tools found in response structure")
+        if DEBUG:
+            print(f"  [{method}] Response structure: {_truncated_repr(result)}")
+        return None, "No tools found in response", False
+
+    except requests.exceptions.HTTPError as e:
+        error_detail = ""
+        if hasattr(e.response, 'text'):
+            error_detail = f": {e.response.text[:200]}"
+        return None, f"HTTP Error {e.response.status_code}{error_detail}", False
+    except requests.exceptions.RequestException as e:
+        return None, f"Request Exception: {e}", True
+    except json.JSONDecodeError as e:
+        return None, f"JSON Decode Error: {e}", False
 
 
 def get_zapier_tools_via_anthropic(
@@ -216,8 +451,8 @@ def get_zapier_tools_via_anthropic(
     api_key = api_key.strip()
     authorization_token = authorization_token.strip()
     
-    # Initialize Anthropic client
-    client = anthropic.Anthropic(api_key=api_key)
+    # Reuse the module-level client (keeps the HTTPS connection warm)
+    client = _get_anthropic_client(api_key)
     
     # Configure MCP server (same as agent.py)
     mcp_servers = [
@@ -239,10 +474,23 @@ Return a JSON array with tool names and descriptions."""
         response = client.beta.messages.create(
             model="claude-3-5-sonnet-20241022",  # Using a valid Claude model
             max_tokens=4000,
-            system="You are a helpful assistant that lists available MCP tools.",
-            messages=[{"role": "user", "content": prompt}],
+            # Both prompt strings are constants: mark them cacheable so
+            # repeated invocations reuse the encoded prefix server-side
+            system=[{
+                "type": "text",
+                "text": "You are a helpful assistant that lists available MCP tools.",
+                "cache_control": {"type": "ephemeral"},
+            }],
+            messages=[{
+                "role": "user",
+                "content": [{
+                    "type": "text",
+                    "text": prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }],
+            }],
             mcp_servers=mcp_servers,
-            betas=["mcp-client-2025-04-04"],
+            betas=["mcp-client-2025-04-04", "prompt-caching-2024-07-31"],
         )
         
         # Extract text response
@@ -251,14 +499,16 @@ Return a JSON array with tool names and descriptions."""
             if hasattr(block, 'type') and block.type == 'text' and hasattr(block, 'text'):
                 text_content += block.text
         
-        # Try to parse JSON from response
-        import re
-        json_match = re.search(r'\[.*\]', text_content, re.DOTALL)
-        if json_match:
+        # Locate the first JSON array and decode exactly it: raw_decode is
+        # O(n) and stops at the array's closing bracket, unlike a greedy
+        # regex that backtracks and drags in trailing prose
+        idx = text_content.find('[')
+        if idx != -1:
             try:
-                tools = json.loads(json_match.group())
-                return tools
-            except:
+                tools, _ = json.JSONDecoder().raw_decode(text_content, idx)
+                if isinstance(tools, list):
+                    return tools
+            except json.JSONDecodeError:
                 pass
         
         # If no JSON found, return empty (we'll need to parse differently)
@@ -281,6 +531,34 @@ def save_tools_to_file(tools: List[Dict[str, Any]], filename: str = "zapier_tool
     print(f"\n✓ Saved {len(tools)} tools to {filepath}")
 
 
+def save_simplified_tools_to_file(tools: List[Dict[str, Any]], filename: str = "zapier_tools_simplified.json"):
+    """Stream a simplified (name/description/inputSchema) view to disk.
+
+    Encodes one tool at a time with iterencode instead of materializing a
+    second full list of dicts next to the original tools list.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    filepath = os.path.join(script_dir, filename)
+
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i, tool in enumerate(tools):
+            simplified = {
+                "name": tool.get("name"),
+                "description": tool.get("description"),
+                "inputSchema": tool.get("inputSchema", {})
+            }
+            if i:
+                f.write(",\n")
+            f.write("  ")
+            for chunk in encoder.iterencode(simplified):
+                # Re-indent the encoded chunk to sit inside the array
+                f.write(chunk.replace("\n", "\n  "))
+        f.write("\n]")
+    print(f"\n✓ Saved {len(tools)} simplified tools to {filepath}")
+
+
 def print_tools_summary(tools: List[Dict[str, Any]]):
     """Print a summary of the tools."""
     print(f"\n{'='*60}")
@@ -288,53 +566,72 @@ def print_tools_summary(tools: List[Dict[str, Any]]):
     print(f"{'='*60}\n")
     
     # Group tools by category if available
-    categories = {}
+    categories = defaultdict(list)
     for tool in tools:
         name = tool.get("name", "Unknown")
         description = tool.get("description", "No description")
-        
+
         # Try to extract category from name (e.g., "gmail_send_email" -> "gmail")
-        category = "Other"
-        if "_" in name:
-            category = name.split("_")[0].title()
-        
-        if category not in categories:
-            categories[category] = []
-        
+        # maxsplit=1 avoids allocating the rest of the split
+        category = name.split("_", 1)[0].title() if "_" in name else "Other"
+
         categories[category].append({
             "name": name,
-            "description": description[:100] + "..." if len(description) > 100 else description
+            "description": textwrap.shorten(description, width=103, placeholder="...") if description else description
         })
-    
-    # Print by category
-    for category, tool_list in sorted(categories.items()):
+
+    # Print by category: sort each bucket in place with a C-level key
+    for category in sorted(categories):
+        tool_list = categories[category]
+        tool_list.sort(key=itemgetter("name"))
         print(f"\n{category} ({len(tool_list)} tools):")
         print("-" * 60)
-        for tool in sorted(tool_list, key=lambda x: x["name"]):
+        for tool in tool_list:
             print(f"  • {tool['name']}")
             if tool['description']:
                 print(f"    {tool['description']}")
-    
+
     print(f"\n{'='*60}")
 
 
 def main():
     """Main function to fetch and display Zapier tools."""
     try:
-        # Try direct MCP API first
-        print("Attempting method 1: Direct MCP API call...")
+        # Race both methods and take whichever succeeds first: either result
+        # is acceptable, so there is no reason to wait for method 1 to fail
+        # before starting method 2
+        print("Racing method 1 (direct MCP API) against method 2 (Anthropic API with MCP)...")
         tools = None
+        failures = []
+        # No context manager here: leaving a 'with' block would join the
+        # losing attempt, so a direct-MCP win would still pay for the
+        # full Anthropic call. The loser is left to finish in a discarded
+        # background thread instead.
+        executor = ThreadPoolExecutor(max_workers=2)
         try:
-            tools = get_zapier_tools()
-        except Exception as e:
-            print(f"Method 1 failed: {e}\n")
-            print("Attempting method 2: Via Anthropic API with MCP...")
-            try:
-                tools = get_zapier_tools_via_anthropic()
-            except Exception as e2:
-                print(f"Method 2 also failed: {e2}")
-                raise Exception(f"Both methods failed. Method 1: {e}. Method 2: {e2}")
-        
+            futures = {
+                executor.submit(get_zapier_tools): "Method 1 (direct MCP API)",
+                executor.submit(get_zapier_tools_via_anthropic): "Method 2 (Anthropic API)",
+            }
+            for future in as_completed(futures):
+                label = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"{label} failed: {e}")
+                    failures.append(f"{label}: {e}")
+                    continue
+                if result:
+                    print(f"✓ {label} returned {len(result)} tools")
+                    tools = result
+                    break
+                failures.append(f"{label}: returned no tools")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not tools and failures:
+            raise Exception(f"Both methods failed. {'. '.join(failures)}")
+
         if not tools:
             print("⚠ No tools found. Check your authorization token and API access.")
             return
@@ -345,16 +642,9 @@ def main():
         # Save to file (will be saved in dataset directory)
         save_tools_to_file(tools)
         
-        # Also save a simplified version with just names and descriptions
-        simplified = [
-            {
-                "name": tool.get("name"),
-                "description": tool.get("description"),
-                "inputSchema": tool.get("inputSchema", {})
-            }
-            for tool in tools
-        ]
-        save_tools_to_file(simplified, "zapier_tools_simplified.json")
+        # Also save a simplified version with just names and descriptions,
+        # streamed to disk without building a second full list
+        save_simplified_tools_to_file(tools, "zapier_tools_simplified.json")
         
         print("\n✓ Done!")
         
@@ -1,23 +1,60 @@
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import atexit
 import subprocess
 import click
+import io
 import os
 import json
+import multiprocessing
+import socket
 import sys
+import time
 import threading
+import queue
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    # Optional: much faster JSON encoding (returns bytes directly);
+    # everything below falls back to the stdlib when it's absent
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: fast zero-copy JSON decoding for POST bodies
+    import msgspec.json
+    _msgspec_decoder = msgspec.json.Decoder()
+except ImportError:
+    _msgspec_decoder = None
+
+# Fastest available JSON decoder: msgspec, then orjson, then the stdlib
+if _msgspec_decoder is not None:
+    def _loads(buf):
+        return _msgspec_decoder.decode(bytes(buf))
+elif orjson is not None:
+    _loads = orjson.loads
+else:
+    _loads = json.loads
 
 global_port = 8080
 
+# Bounded pool for agent runs: reuses threads across requests instead of
+# spawning a fresh thread per POST
+_WORKER_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agent-worker")
+
 # Add near the top after other imports
 def launch_electron_popup(port):
     """Launch the Electron popup with the correct API URL."""
     electron_dir = Path(__file__).parent / "electron-popup"
 
     if not electron_dir.exists():
-        print(f"ERROR: Electron popup directory not found at {electron_dir}")
-        log_to_file(f"ERROR: Electron popup directory not found at {electron_dir}")
+        logger.error(f"Electron popup directory not found at {electron_dir}")
         return False
 
     api_url = f"http://localhost:{port}"
@@ -48,12 +85,10 @@ def launch_electron_popup(port):
 
         if not npm_path:
             error_msg = "npm not found. Please install Node.js and npm."
-            print(f"ERROR: {error_msg}")
-            log_to_file(f"ERROR: {error_msg}")
+            logger.error(error_msg)
             return False
 
-        print(f"DEBUG: Found npm at: {npm_path}")
-        log_to_file(f"DEBUG: Found npm at: {npm_path}")
+        logger.debug("Found npm at: %s", npm_path)
 
         # Set environment variable
         env = os.environ.copy()
@@ -64,8 +99,7 @@ def launch_electron_popup(port):
         current_path = env.get('PATH', '')
         env['PATH'] = ':'.join(extra_paths) + ':' + current_path
 
-        print(f"Launching Electron popup with API_URL={api_url}")
-        log_to_file(f"Launching Electron popup with API_URL={api_url}")
+        logger.info(f"Launching Electron popup with API_URL={api_url}")
 
         # Use the full path to npm
         process = subprocess.Popen(
@@ -76,8 +110,7 @@ def launch_electron_popup(port):
             start_new_session=False
         )
 
-        print(f"Electron popup launched successfully (PID: {process.pid})")
-        log_to_file(f"Electron popup launched successfully (PID: {process.pid})")
+        logger.info(f"Electron popup launched successfully (PID: {process.pid})")
 
         # Wait a bit to see if there are immediate errors
         import time
@@ -85,22 +118,19 @@ def launch_electron_popup(port):
 
         # Check if process is still running
         if process.poll() is not None:
-            print(f"WARNING: Electron process exited immediately with code {process.returncode}")
-            log_to_file(f"WARNING: Electron process exited immediately with code {process.returncode}")
+            logger.warning(f"Electron process exited immediately with code {process.returncode}")
             return False
 
         return True
 
     except FileNotFoundError as e:
         error_msg = f"npm not found: {e}. Please install Node.js and npm first."
-        print(f"ERROR: {error_msg}")
-        log_to_file(f"ERROR: {error_msg}")
+        logger.error(error_msg)
         return False
 
     except Exception as e:
         error_msg = f"Failed to launch Electron popup: {str(e)}"
-        print(f"ERROR: {error_msg}")
-        log_to_file(f"ERROR: {error_msg}")
+        logger.error(error_msg)
         import traceback
         traceback.print_exc()
         return False
@@ -113,23 +143,16 @@ from dotenv import load_dotenv
 server_dir = Path(__file__).parent
 env_path = server_dir / ".env"
 
-# Print debug info about .env file
-print(f"DEBUG: server.py location: {Path(__file__).absolute()}")
-print(f"DEBUG: Looking for .env at: {env_path.absolute()}")
-print(f"DEBUG: .env exists: {env_path.exists()}")
-
-# Load .env file with explicit path
+# Load .env file with explicit path; diagnostics live in _dump_env_debug,
+# invoked from main() only when MOUSETRON_DEBUG is set
 if env_path.exists():
-    print(f"DEBUG: Loading .env from {env_path}")
-
-    # Read the file manually to see what's in it
-    with open(env_path, 'r') as f:
-        content = f.read()
+    # Read the file once and hand the in-memory content to dotenv, instead
+    # of letting load_dotenv reopen and reread the same file
+    _env_content = env_path.read_text()
+    if os.environ.get("MOUSETRON_DEBUG") == "1":
         print(f"DEBUG: .env file content (first 200 chars):")
-        print(repr(content[:200]))
-
-    load_dotenv(dotenv_path=env_path, override=True)
-    print(f"DEBUG: Loaded .env from {env_path}")
+        print(repr(_env_content[:200]))
+    load_dotenv(stream=io.StringIO(_env_content), override=True)
 else:
     print(f"ERROR: .env file not found at {env_path}")
     # Try to load from current working directory as fallback
@@ -146,40 +169,83 @@ from EMA import EMA
 
 HOST = "localhost"  # listen on all interfaces
 
+# Largest POST body we accept (1 MiB); real payloads are a few KB
+MAX_BODY = 1 << 20
+
+# Verbose per-request output is opt-in: stdout writes and header/body dumps
+# are pure overhead on the hot path when nobody is watching
+DEBUG = os.environ.get("MOUSETRON_DEBUG") == "1"
+
 # Log file path
 LOG_FILE = os.path.expanduser("~/Library/Application Support/Logi/LogiPluginService/Logs/plugin_logs/MouseTron.log")
 
 
+_log_dir_ready = False
+
+
 def ensure_log_directory():
-    """Ensure the log directory exists."""
-    log_dir = os.path.dirname(LOG_FILE)
-    os.makedirs(log_dir, exist_ok=True)
+    """Ensure the log directory exists; only the first call hits the filesystem."""
+    global _log_dir_ready
+    if _log_dir_ready:
+        return
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    _log_dir_ready = True
+
+
+# Every directory the server writes into, created once at startup so the
+# per-request/per-write paths never need a mkdir syscall
+_STARTUP_DIRS = (
+    server_dir / "containers",
+    server_dir / "recommendations",
+    server_dir / "dataset",
+)
+
+
+def _ensure_startup_dirs():
+    """Create all output directories once, before serving."""
+    for directory in _STARTUP_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+# Asynchronous logging: the request path only enqueues a record; a background
+# QueueListener thread does the timestamp formatting and file I/O, replacing
+# the old open/write/close per line
+ensure_log_directory()
+logger = logging.getLogger("mousetron")
+logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=3)
+_file_handler.setFormatter(logging.Formatter(
+    "[%(asctime)s.%(msecs)03d] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+))
+_log_listener = logging.handlers.QueueListener(_log_queue, _file_handler)
+_log_listener.start()
+# Drain queued records and close the file on interpreter shutdown so the
+# tail of the log is not lost when the server is killed
+atexit.register(_log_listener.stop)
 
 
 def log_to_file(message):
-    """Append a message to the log file with timestamp."""
-    ensure_log_directory()
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    with open(LOG_FILE, 'a') as f:
-        f.write(f"[{timestamp}] {message}\n")
-
-
-# Print environment variable to verify it's loaded
-anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-zapier_token = os.getenv("ZAPIER_AUTHORIZATION_TOKEN")
-print(f"DEBUG: ANTHROPIC_API_KEY loaded: {anthropic_key[:20] + '...' if anthropic_key else 'None'}")
-print(f"DEBUG: ZAPIER_AUTHORIZATION_TOKEN loaded: {zapier_token[:20] + '...' if zapier_token else 'None'}")
-
-# Print all environment variables that start with ANTHROPIC or ZAPIER
-print("DEBUG: All ANTHROPIC/ZAPIER env vars:")
-for key, value in os.environ.items():
-    if 'ANTHROPIC' in key or 'ZAPIER' in key:
-        print(f"  {key}: {value[:20] if value else 'None'}...")
-
-log_to_file(f"DEBUG: .env path: {env_path.absolute()}")
-log_to_file(f"DEBUG: .env exists: {env_path.exists()}")
-log_to_file(f"DEBUG: ANTHROPIC_API_KEY loaded: {anthropic_key[:20] + '...' if anthropic_key else 'None'}")
-log_to_file(f"DEBUG: ZAPIER_AUTHORIZATION_TOKEN loaded: {zapier_token[:20] + '...' if zapier_token else 'None'}")
+    """Append a message to the log file (asynchronously, via the log queue)."""
+    logger.info(message)
+
+
+def _dump_env_debug():
+    """Print/log .env diagnostics; startup-only and opt-in via MOUSETRON_DEBUG."""
+    print(f"DEBUG: server.py location: {Path(__file__).absolute()}")
+    print(f"DEBUG: Looking for .env at: {env_path.absolute()}")
+    print(f"DEBUG: .env exists: {env_path.exists()}")
+
+    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+    zapier_token = os.getenv("ZAPIER_AUTHORIZATION_TOKEN")
+    print(f"DEBUG: ANTHROPIC_API_KEY loaded: {anthropic_key[:20] + '...' if anthropic_key else 'None'}")
+    print(f"DEBUG: ZAPIER_AUTHORIZATION_TOKEN loaded: {zapier_token[:20] + '...' if zapier_token else 'None'}")
+
+    log_to_file(f"DEBUG: .env path: {env_path.absolute()}")
+    log_to_file(f"DEBUG: .env exists: {env_path.exists()}")
+    log_to_file(f"DEBUG: ANTHROPIC_API_KEY loaded: {anthropic_key[:20] + '...' if anthropic_key else 'None'}")
+    log_to_file(f"DEBUG: ZAPIER_AUTHORIZATION_TOKEN loaded: {zapier_token[:20] + '...' if zapier_token else 'None'}")
 
 # Initialize agent once at module level - MUST be declared before get_agent() is defined
 _agent = None
@@ -207,10 +273,9 @@ def get_ema():
     global _ema
     if _ema is None:
         try:
-            # Create containers directory
+            # Containers directory is created by _ensure_startup_dirs
             containers_dir = server_dir / "containers"
-            containers_dir.mkdir(exist_ok=True)
-            
+
             # Initialize EMA with containers directory
             _ema = EMA(k=10, t=50, nr=2, nf=5, ns=5, containers_dir=containers_dir)
             print("EMA initialized successfully")
@@ -237,15 +302,11 @@ def load_showcase_patterns():
             print(f"Warning: Showcase patterns file not found at {patterns_file}")
             return False
         
-        # Load pattern blocks from file, skipping empty lines and separators
-        blocks = []
-        with open(patterns_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and separator lines (just dashes)
-                if line and line != '-':
-                    blocks.append(line)
-        
+        # Load pattern blocks in one read, skipping empty lines and separators
+        lines = patterns_file.read_text(encoding='utf-8').splitlines()
+        blocks = [stripped for line in lines
+                  if (stripped := line.strip()) and stripped != '-']
+
         if not blocks:
             log_to_file("No blocks found in showcase patterns file")
             print("No blocks found in showcase patterns file")
@@ -254,10 +315,9 @@ def load_showcase_patterns():
         log_to_file(f"Loading {len(blocks)} blocks from showcase patterns file")
         print(f"Loading {len(blocks)} blocks from showcase patterns file...")
         
-        # Add all blocks to EMA
-        for block in blocks:
-            ema.add_block(block)
-        
+        # Add all blocks to EMA in one batch (single frequency-table rebuild)
+        ema.add_blocks(blocks)
+
         # Save EMA containers to JSON files
         save_success = ema.save_containers()
         if save_success:
@@ -267,9 +327,10 @@ def load_showcase_patterns():
             log_to_file("Warning: Patterns loaded but failed to save containers")
             print("Warning: Patterns loaded but failed to save containers")
         
-        # Generate recommendations after loading patterns (regardless of save status)
-        generate_recommendations()
-        
+        # Generate recommendations after loading patterns (regardless of save
+        # status); goes through the serial EMA writer like every other write
+        _EMA_WRITER.submit(generate_recommendations)
+
         return save_success
             
     except Exception as e:
@@ -284,84 +345,151 @@ _agent_state_lock = threading.Lock()
 _current_agent_state = None
 _agent_running = False
 
+# SSE subscribers: each /api/events connection gets its own queue that
+# set_agent_state feeds on every state change (None = stream done)
+_subscribers = []
+
+# Pre-serialized /api/steps response, rebuilt once per state change instead
+# of on every poll
+_cached_steps_json = b"[]"
+
+# Immutable steps projection built by set_agent_state: readers grab one
+# reference instead of copying the plan under the lock
+_steps_snapshot = ()
+
+
+def _broadcast_steps_locked(payload):
+    """Push a serialized steps snapshot to every SSE subscriber.
+
+    Caller must hold _agent_state_lock.
+    """
+    for subscriber in _subscribers:
+        subscriber.put(payload)
+
 def get_current_steps():
-    """Get current step statuses in a thread-safe way."""
-    with _agent_state_lock:
-        if _current_agent_state is None:
-            return []
-        
-        plan = _current_agent_state.get("plan", [])
-        steps = []
-        for step in plan:
-            steps.append({
-                "step": step.get("description", "Unknown"),
-                "status": step.get("status", "pending")
-            })
-        return steps
+    """Get current step statuses without taking a lock.
+
+    set_agent_state publishes a fully-built immutable tuple with a single
+    reference assignment, so readers just load the current reference - no
+    critical section at all on the /api/steps hot path.
+    """
+    return list(_steps_snapshot)
 
 
 def set_agent_state(state):
     """Update the current agent state in a thread-safe way."""
-    global _current_agent_state, _agent_running
+    global _current_agent_state, _agent_running, _cached_steps_json, _steps_snapshot
+    global _state_generation
     with _agent_state_lock:
+        _state_generation += 1
         _current_agent_state = state
         _agent_running = state is not None
+        # Build the projection and serialize it once; pollers, SSE
+        # subscribers and get_current_steps all reuse the result
+        plan = state.get("plan", []) if state else []
+        steps = tuple({"step": s.get("description", "Unknown"), "status": s.get("status", "pending")}
+                      for s in plan)
+        _steps_snapshot = steps
+        if orjson is not None:
+            _cached_steps_json = orjson.dumps(list(steps))
+            payload = _cached_steps_json.decode("utf-8")
+        else:
+            payload = json.dumps(list(steps))
+            _cached_steps_json = payload.encode("utf-8")
+        _broadcast_steps_locked(payload)
+
+
+# Pending deferred clear_agent_state timer (guarded by _agent_state_lock).
+# The generation counter detects a late-firing timer from a previous run:
+# set_agent_state bumps it, and a stale timer's clear becomes a no-op.
+_clear_timer = None
+_state_generation = 0
+
+
+def _schedule_state_clear(delay=5.0):
+    """Keep the final state visible for a short window without parking a
+    worker thread; a timer clears it and a new run can cancel the timer."""
+    global _clear_timer
+    with _agent_state_lock:
+        if _clear_timer is not None:
+            _clear_timer.cancel()
+        _clear_timer = threading.Timer(delay, clear_agent_state, args=(_state_generation,))
+        _clear_timer.daemon = True
+        _clear_timer.start()
 
 
-def clear_agent_state():
+def _cancel_pending_clear():
+    """Cancel a pending deferred clear so a new run's state isn't wiped."""
+    global _clear_timer
+    with _agent_state_lock:
+        if _clear_timer is not None:
+            _clear_timer.cancel()
+            _clear_timer = None
+
+
+def clear_agent_state(expected_generation=None):
     """Clear the agent state when execution completes."""
     global _current_agent_state, _agent_running
     with _agent_state_lock:
+        # A newer run has replaced the state this timer was scheduled for
+        if expected_generation is not None and expected_generation != _state_generation:
+            return
         # Keep the final state for a bit, but mark as not running
         _agent_running = False
+        # Tell SSE subscribers the run is over
+        for subscriber in _subscribers:
+            subscriber.put(None)
+
+
+# Step statuses that count as "actually executed" when mining tool names
+_EXECUTED_STATUSES = frozenset(("completed", "failed", "in_progress"))
 
 
 def extract_tool_names_from_state(state):
     """Extract tool names from completed steps in order."""
     if not state or "plan" not in state:
         return []
-    
-    tool_names = []
+
     plan = state.get("plan", [])
-    
-    # Sort by step ID to maintain order
-    sorted_steps = sorted(plan, key=lambda x: x.get("id", 0))
-    
-    for step in sorted_steps:
-        # Get tool name from the step
-        tool_name = step.get("tool_name")
-        
-        # Only include steps that were actually executed (completed or failed)
-        status = step.get("status", "pending")
-        if status in ["completed", "failed", "in_progress"] and tool_name:
-            # Clean up tool name (remove any prefixes/suffixes if needed)
-            tool_name_clean = tool_name.strip()
-            if tool_name_clean:
-                # Allow duplicates since same tool can be called multiple times
-                tool_names.append(tool_name_clean)
-    
-    return tool_names
+
+    # Filter first, pre-extracting (id, name) pairs so the sort compares
+    # plain tuples instead of calling a key function per element
+    executed = sorted(
+        (step.get("id", 0), (step.get("tool_name") or "").strip())
+        for step in plan
+        if step.get("status", "pending") in _EXECUTED_STATUSES and step.get("tool_name")
+    )
+
+    # Allow duplicates since same tool can be called multiple times
+    return [name for _step_id, name in executed if name]
+
+
+# Parsed zapier_tools.json keyed by its mtime; reparsed only when the
+# file actually changes on disk
+_tool_desc_cache = None
 
 
 def load_tool_descriptions():
     """Load tool descriptions from zapier_tools.json into a dictionary."""
+    global _tool_desc_cache
     tools_file = server_dir / "dataset" / "zapier_tools.json"
     tool_descriptions = {}
-    
+
     try:
         if tools_file.exists():
-            with open(tools_file, "r", encoding="utf-8") as f:
-                tools = json.load(f)
-                for tool in tools:
-                    tool_name = tool.get("name", "")
-                    description = tool.get("description", "")
-                    tool_descriptions[tool_name] = description
+            st = tools_file.stat()
+            if _tool_desc_cache is not None and _tool_desc_cache[0] == st.st_mtime_ns:
+                return _tool_desc_cache[1]
+            tools = json.loads(tools_file.read_bytes())
+            for tool in tools:
+                tool_name = tool.get("name", "")
+                description = tool.get("description", "")
+                tool_descriptions[tool_name] = description
+            _tool_desc_cache = (st.st_mtime_ns, tool_descriptions)
         else:
-            log_to_file(f"Warning: zapier_tools.json not found at {tools_file}")
-            print(f"Warning: zapier_tools.json not found at {tools_file}")
+            logger.warning(f"zapier_tools.json not found at {tools_file}")
     except Exception as e:
-        log_to_file(f"ERROR loading tool descriptions: {str(e)}")
-        print(f"ERROR loading tool descriptions: {str(e)}")
+        logger.error(f"Error loading tool descriptions: {str(e)}")
     
     return tool_descriptions
 
@@ -380,22 +508,43 @@ def get_tool_description(tool_name, tool_descriptions):
     return tool_descriptions.get(lookup_name, f"No description available for {tool_name}")
 
 
+# Serial writer so recommendation/EMA disk I/O happens off the request
+# thread, one batch at a time
+_EMA_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ema-writer")
+
+
+def _dumps_indent(obj):
+    """Serialize obj to pretty-printed JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _write_file_atomic(path, payload):
+    """Write payload bytes to path via a temp file and atomic rename."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
 def generate_recommendations():
     """Generate recommendation JSON files from EMA pick functions."""
     try:
         ema = get_ema()
         if not ema:
-            log_to_file("ERROR: EMA not initialized for recommendations")
-            print("ERROR: EMA not initialized for recommendations")
+            logger.error("EMA not initialized for recommendations")
             return False
         
         # Load tool descriptions
         tool_descriptions = load_tool_descriptions()
         
-        # Create recommendations directory
+        # Recommendations directory is created by _ensure_startup_dirs
         recommendations_dir = server_dir / "recommendations"
-        recommendations_dir.mkdir(exist_ok=True)
-        
+
         # Update frequency table before picking (ensures it's up to date)
         ema._update_frequency_table()
         
@@ -403,12 +552,16 @@ def generate_recommendations():
         if len(ema.frequency_table) > ema.t:
             ema._evict_from_frequency_table()
         
+        # Build every file's contents in memory first, then publish them in a
+        # single write pass; no partially-written file is ever visible
+        pending = []
+
         # Generate recent tools combo files (nr files) using pick_from_recent()
         recent_selections = ema.pick_from_recent()
         for i, selection in enumerate(recent_selections, 1):
             tool_names = selection.get("names", "").split(", ")
             recommendations = []
-            
+
             for tool_name in tool_names:
                 tool_name = tool_name.strip()
                 if tool_name:
@@ -417,13 +570,11 @@ def generate_recommendations():
                         "tool_name": tool_name,
                         "description": description
                     })
-            
+
             if recommendations:
                 filename = recommendations_dir / f"recent_tools_combo_{i}.json"
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(recommendations, f, indent=2)
-                log_to_file(f"Generated {filename}")
-        
+                pending.append((filename, _dumps_indent(recommendations)))
+
         # Generate recent tool single files (ns files) using get_recent_single_tools()
         single_tools = ema.get_recent_single_tools()
         for i, tool_name in enumerate(single_tools, 1):
@@ -433,21 +584,18 @@ def generate_recommendations():
                     "tool_name": tool_name,
                     "description": description
                 }]
-                
+
                 filename = recommendations_dir / f"recent_tool_single_{i}.json"
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(recommendation, f, indent=2)
-                log_to_file(f"Generated {filename}")
-        
+                pending.append((filename, _dumps_indent(recommendation)))
+
         # Generate stable tools combo files (nf files) using pick_from_frequency()
         frequency_selections = ema.pick_from_frequency()
-        log_to_file(f"Found {len(frequency_selections)} stable tool combinations (requested {ema.nf})")
-        print(f"Found {len(frequency_selections)} stable tool combinations (requested {ema.nf})")
-        
+        logger.info(f"Found {len(frequency_selections)} stable tool combinations (requested {ema.nf})")
+
         for i, selection in enumerate(frequency_selections, 1):
             tool_names = selection.get("names", "").split(", ")
             recommendations = []
-            
+
             for tool_name in tool_names:
                 tool_name = tool_name.strip()
                 if tool_name:
@@ -456,36 +604,34 @@ def generate_recommendations():
                         "tool_name": tool_name,
                         "description": description
                     })
-            
+
             if recommendations:
                 filename = recommendations_dir / f"stable_tools_combo_{i}.json"
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(recommendations, f, indent=2)
-                log_to_file(f"Generated {filename}")
-        
-        print(f"✓ Generated recommendation files in {recommendations_dir}")
-        log_to_file(f"Generated recommendation files successfully")
+                pending.append((filename, _dumps_indent(recommendations)))
+
+        for filename, payload in pending:
+            _write_file_atomic(filename, payload)
+            log_to_file(f"Generated {filename}")
+
+        logger.info(f"Generated recommendation files in {recommendations_dir}")
         return True
         
     except Exception as e:
         error_msg = f"Error generating recommendations: {str(e)}"
-        log_to_file(f"ERROR: {error_msg}")
-        print(f"ERROR: {error_msg}")
+        logger.error(error_msg)
         return False
 
 
 def update_ema_containers(tool_names):
     """Update EMA containers directly with tool names and save to JSON files."""
     if not tool_names:
-        log_to_file("No tool names to update EMA with")
-        print("No tool names to update EMA with")
+        logger.info("No tool names to update EMA with")
         return False
     
     try:
         ema = get_ema()
         if not ema:
-            log_to_file("ERROR: EMA not initialized")
-            print("ERROR: EMA not initialized")
+            logger.error("EMA not initialized")
             return False
         
         # Convert steps list to a comma-separated block string
@@ -496,22 +642,20 @@ def update_ema_containers(tool_names):
         
         # Save EMA containers to JSON files
         if ema.save_containers():
-            log_to_file(f"Updated EMA with {len(tool_names)} tools and saved containers: {tool_names}")
-            print(f"✓ Updated EMA with {len(tool_names)} tools and saved containers")
-            
-            # Generate recommendations after updating EMA
-            generate_recommendations()
+            logger.info(f"Updated EMA with {len(tool_names)} tools and saved containers: {tool_names}")
             
+            # Generate recommendations off the request thread; the serial
+            # writer keeps successive batches ordered
+            _EMA_WRITER.submit(generate_recommendations)
+
             return True
         else:
-            log_to_file(f"Warning: EMA updated but failed to save containers")
-            print(f"Warning: EMA updated but failed to save containers")
+            logger.warning("EMA updated but failed to save containers")
             return False
             
     except Exception as e:
         error_msg = f"Error updating EMA containers: {str(e)}"
-        log_to_file(f"ERROR: {error_msg}")
-        print(f"ERROR: {error_msg}")
+        logger.error(error_msg)
         return False
 
 
@@ -543,18 +687,37 @@ def run_agent_async(command, feedback, app):
             # Use streaming to get intermediate states
             # This allows us to update the state as the agent progresses
             final_state = None
+            last_hash = None
+            last_publish = 0.0
             for state_update in agent.graph.stream(initial_state):
                 # state_update is a dict with node names as keys
                 # The last update contains the final state
                 for node_name, state in state_update.items():
+                    final_state = state
+
+                    # Skip publishes when the visible plan hasn't changed, and
+                    # coalesce update bursts to at most one per 50ms (the UI
+                    # polls at ~200ms); the final state is always re-published
+                    # after the loop
+                    # Hash everything the published projection exposes
+                    # (description and status): replanning can rewrite
+                    # descriptions while ids and statuses stay the same
+                    plan = state.get("plan") or []
+                    state_hash = hash(tuple(
+                        (s.get("id"), s.get("description"), s.get("status")) for s in plan
+                    ))
+                    now = time.monotonic()
+                    if state_hash == last_hash or now - last_publish < 0.05:
+                        continue
+                    last_hash = state_hash
+                    last_publish = now
+
                     # Update state after each node execution
                     set_agent_state(state)
-                    final_state = state
-                    
+
                     # Log progress
-                    if "plan" in state and state["plan"]:
-                        plan_steps = len(state["plan"])
-                        print(f"Agent progress: {node_name} - {plan_steps} steps planned")
+                    if plan:
+                        print(f"Agent progress: {node_name} - {len(plan)} steps planned")
             
             # Ensure final state is set
             if final_state:
@@ -565,16 +728,17 @@ def run_agent_async(command, feedback, app):
                 if tool_names:
                     log_to_file(f"Agent finished. Extracted {len(tool_names)} tool names: {tool_names}")
                     print(f"\n=== Agent finished. Extracted {len(tool_names)} tool names ===")
-                    update_ema_containers(tool_names)
+                    # EMA mutation + disk I/O happens on the serial writer, so
+                    # concurrent agent completions can't interleave updates
+                    _EMA_WRITER.submit(update_ema_containers, tool_names)
                 else:
                     log_to_file("Agent finished but no tool names found in completed steps")
                     print("Agent finished but no tool names found in completed steps")
             
-            # Keep state for a few seconds, then clear
-            import time
-            time.sleep(5)  # Keep final state visible for 5 seconds
-            clear_agent_state()
-            
+            # Keep final state visible for 5 seconds, then clear - via a
+            # timer so this worker thread is released immediately
+            _schedule_state_clear()
+
         except Exception as e:
             error_state = {
                 "command": command,
@@ -587,129 +751,188 @@ def run_agent_async(command, feedback, app):
             set_agent_state(error_state)
             log_to_file(f"ERROR in agent thread: {e}")
             print(f"ERROR in agent thread: {e}")
-            import time
-            time.sleep(5)  # Show error for 5 seconds
-            clear_agent_state()
-    
-    thread = threading.Thread(target=agent_runner, daemon=True)
-    thread.start()
-    return thread
+            _schedule_state_clear()  # Show error for 5 seconds
+
+    # A new run supersedes any pending clear from the previous one
+    _cancel_pending_clear()
+    return _WORKER_POOL.submit(agent_runner)
 
 
 
 class SimpleRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, so the UI's frequent polls reuse one
+    # TCP connection; every non-streaming response must carry Content-Length
+    protocol_version = "HTTP/1.1"
+
+    def _send_bytes(self, status, ctype, payload):
+        """Send a complete small response with a single socket write."""
+        header = (
+            f"{self.protocol_version} {status} {HTTPStatus(status).phrase}\r\n"
+            f"Server: {self.version_string()}\r\n"
+            f"Date: {self.date_time_string()}\r\n"
+            f"Content-Type: {ctype}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        self.wfile.write(header + payload)
+
+    def _handle_tools_post(self, data):
+        """Handle a tool-names POST (manual updates or backward compatibility).
+
+        Returns (response_message, status).
+        """
+        steps = data.get("steps", [])
+        log_to_file(f"Received tool names POST at {self.path} ({len(steps)} steps)")
+        logger.debug("tool names payload: %s", data)
+        if DEBUG:
+            print(f"\n=== Received tool names POST ===")
+            print(f"Path: {self.path}")
+            print(f"Steps: {steps}")
+
+        # Save tool names to a text file
+        try:
+            # Save to dataset/agent_tool_names.txt (relative to server.py location)
+            tools_file = server_dir / "dataset" / "agent_tool_names.txt"
+
+            # Write tool names, one per line
+            with open(tools_file, "w", encoding="utf-8") as f:
+                for tool_name in steps:
+                    f.write(f"{tool_name}\n")
+
+            if DEBUG:
+                print(f"✓ Saved {len(steps)} tool names to {tools_file}")
+            log_to_file(f"Saved {len(steps)} tool names to {tools_file}")
+            response_message = f"Received and saved {len(steps)} tool names to {tools_file.name}"
+        except Exception as save_error:
+            error_msg = f"Error saving tool names: {str(save_error)}"
+            print(f"ERROR: {error_msg}")
+            log_to_file(f"ERROR: {error_msg}")
+            response_message = f"Received {len(steps)} tool names but failed to save: {str(save_error)}"
+
+        # Update EMA containers on the writer thread: EMA has no internal
+        # locking, so every mutation must go through _EMA_WRITER or two
+        # concurrent POSTs (or a POST racing an agent completion) could
+        # corrupt the recency deques or interleave container writes.
+        # Blocking on the result keeps the response message accurate.
+        if _EMA_WRITER.submit(update_ema_containers, steps).result():
+            response_message += f" | EMA containers updated and saved"
+
+        log_to_file(f"Tool names received: {steps}")
+        return response_message, 200
+
+    def _handle_agent_post(self, data):
+        """Handle a Format 2 POST (has 'input'); returns (response_message, status).
+
+        Only this handler needs the agent, so initialization stays deferred.
+        """
+        if get_agent() is None:
+            log_to_file("ERROR: Format 2 POST received but agent is not initialized")
+            return "Agent not initialized. Check server logs.", 500
+
+        selected_text = data.get("selectedText", "")
+        application_name = data.get("applicationName", "Unknown")
+        user_input = data.get("input", "")
+
+        if DEBUG:
+            print(f"\n=== Format 2 POST detected ===")
+            print(f"Command: {selected_text[:100]}...")
+            print(f"App: {application_name}")
+            print(f"Feedback: {user_input}")
+            print(f"Running agent...\n")
+
+        log_to_file("=== Format 2 POST - Running agent ===")
+        logger.debug("command: %s | app: %s | feedback: %s",
+                     selected_text, application_name, user_input)
+
+        try:
+            # Run the agent in a background thread
+            run_agent_async(selected_text, user_input, application_name)
+            log_to_file("Agent started in background thread")
+            if DEBUG:
+                print(f"\n=== Agent started in background ===")
+            return "Agent started. Check /api/steps for status.", 200
+
+        except Exception as e:
+            error_msg = f"Error starting agent: {str(e)}"
+            print(f"\n=== ERROR: {error_msg} ===")
+            log_to_file(f"ERROR: {error_msg}")
+            return f"Error: {str(e)}", 500
+
+    # One dict lookup routes the common paths straight to their handlers
+    _POST_ROUTES = {
+        "/api/tools": _handle_tools_post,
+        "/api/agent": _handle_agent_post,
+    }
+
     def do_POST(self):
-        # Get content length (how many bytes to read)
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length) if content_length > 0 else b''
-
-        # Print request info
-        print("=== POST request received ===")
-        print(f"Path: {self.path}")
-        print("Headers:")
-        print(self.headers)
-        print("Body (raw):", body)
-
-        body_decoded = None
+        # Get content length (how many bytes to read); an unparseable or
+        # negative value gets a 400 rather than letting int() or
+        # bytearray() raise mid-handler
+        raw_length = self.headers.get('Content-Length', '0')
         try:
-            body_decoded = body.decode("utf-8")
-            print("Body (decoded):", body_decoded)
-        except UnicodeDecodeError:
-            body_decoded = "<binary data>"
-            print("Body is not valid UTF-8 text")
-
-        # Log to file
-        log_to_file("=== POST request received ===")
-        log_to_file(f"Path: {self.path}")
-        log_to_file(f"Headers: {dict(self.headers)}")
-        log_to_file(f"Body: {body_decoded}")
-        log_to_file("")  # Empty line for separation
+            content_length = int(raw_length)
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            log_to_file(f"Rejected POST {self.path}: bad Content-Length {raw_length!r}")
+            # Any body bytes are left unread; keeping the connection alive
+            # would let them corrupt the next request on this socket
+            self.close_connection = True
+            self._send_bytes(400, "text/plain", b"Invalid Content-Length")
+            return
+        # Refuse oversized bodies before allocating anything: a bogus
+        # Content-Length must not be able to exhaust memory
+        if content_length > MAX_BODY:
+            log_to_file(f"Rejected POST {self.path}: body of {content_length} bytes exceeds cap")
+            # The unread body would corrupt a kept-alive connection
+            self.close_connection = True
+            self._send_bytes(413, "text/plain", b"Request body too large")
+            return
+        # Read into a preallocated buffer; json.loads accepts bytes directly,
+        # so the body is never copied through an intermediate str
+        body = bytearray(content_length)
+        if content_length > 0:
+            self.rfile.readinto(memoryview(body))
+
+        if DEBUG:
+            sys.stdout.write(f"POST {self.path} len={content_length}\n")
+
+        # One summary line per request; header/body dumps are DEBUG-level so
+        # the logging module skips formatting them when the level is disabled
+        log_to_file(f"POST {self.path} len={content_length}")
+        logger.debug("headers: %s", self.headers)
+        if DEBUG:
+            logger.debug("body: %s", body.decode("utf-8", errors="replace"))
 
         # Try to parse JSON and check request type
         response_message = "OK"
         response_status = 200
         
-        # Get agent instance for Format 2 requests
-        agent = get_agent()
-
         launch_electron_popup(global_port)
 
-        if body_decoded and body_decoded != "<binary data>":
+        # Only attempt a JSON parse when the request plausibly carries JSON:
+        # declared Content-Type, or a body starting with '{' / '['. Cheaper
+        # than paying for a JSONDecodeError on every plain-text POST.
+        content_type = self.headers.get('Content-Type', '')
+        looks_like_json = 'json' in content_type.lower() or bytes(body[:1]) in (b'{', b'[')
+
+        if body and looks_like_json:
             try:
-                data = json.loads(body_decoded)
-                
-                # Check if this is a tools POST (has 'steps' field) - typically at /api/tools
-                if "steps" in data or self.path == "/api/tools":
-                    # This is a POST with tool names (for manual updates or backward compatibility)
-                    steps = data.get("steps", [])
-                    log_to_file(f"Received tool names POST at {self.path}: {json.dumps(data, indent=2)}")
-                    print(f"\n=== Received tool names POST ===")
-                    print(f"Path: {self.path}")
-                    print(f"Steps: {steps}")
-                    
-                    # Save tool names to a text file
-                    try:
-                        # Save to dataset/agent_tool_names.txt (relative to server.py location)
-                        dataset_dir = server_dir / "dataset"
-                        dataset_dir.mkdir(exist_ok=True)  # Create directory if it doesn't exist
-                        tools_file = dataset_dir / "agent_tool_names.txt"
-                        
-                        # Write tool names, one per line
-                        with open(tools_file, "w", encoding="utf-8") as f:
-                            for tool_name in steps:
-                                f.write(f"{tool_name}\n")
-                        
-                        print(f"✓ Saved {len(steps)} tool names to {tools_file}")
-                        log_to_file(f"Saved {len(steps)} tool names to {tools_file}")
-                        response_message = f"Received and saved {len(steps)} tool names to {tools_file.name}"
-                    except Exception as save_error:
-                        error_msg = f"Error saving tool names: {str(save_error)}"
-                        print(f"ERROR: {error_msg}")
-                        log_to_file(f"ERROR: {error_msg}")
-                        response_message = f"Received {len(steps)} tool names but failed to save: {str(save_error)}"
-                    
-                    # Update EMA containers directly
-                    if update_ema_containers(steps):
-                        response_message += f" | EMA containers updated and saved"
-                    
-                    log_to_file(f"Tool names received: {steps}")
-                
-                # Check if this is Format 2 (has 'input' field)
-                elif "input" in data and agent is not None:
-                    selected_text = data.get("selectedText", "")
-                    application_name = data.get("applicationName", "Unknown")
-                    user_input = data.get("input", "")
-                    
-                    print(f"\n=== Format 2 POST detected ===")
-                    print(f"Command: {selected_text[:100]}...")
-                    print(f"App: {application_name}")
-                    print(f"Feedback: {user_input}")
-                    print(f"Running agent...\n")
-                    
-                    log_to_file("=== Format 2 POST - Running agent ===")
-                    log_to_file(f"Command: {selected_text}")
-                    log_to_file(f"App: {application_name}")
-                    log_to_file(f"Feedback: {user_input}")
-                    
-                    try:
-                        # Run the agent in a background thread
-                        run_agent_async(selected_text, user_input, application_name)
-                        response_message = "Agent started. Check /api/steps for status."
-                        log_to_file("Agent started in background thread")
-                        print(f"\n=== Agent started in background ===")
-                        
-                    except Exception as e:
-                        error_msg = f"Error starting agent: {str(e)}"
-                        print(f"\n=== ERROR: {error_msg} ===")
-                        log_to_file(f"ERROR: {error_msg}")
-                        response_message = f"Error: {str(e)}"
-                        response_status = 500
-                
-                elif "input" in data and agent is None:
-                    response_message = "Agent not initialized. Check server logs."
-                    response_status = 500
-                    log_to_file("ERROR: Format 2 POST received but agent is not initialized")                    
-            except json.JSONDecodeError as e:
+                data = _loads(body)
+
+                # Known paths dispatch through one dict lookup; anything else
+                # falls back to inspecting the JSON keys for legacy clients
+                handler = self._POST_ROUTES.get(self.path)
+                if handler is None:
+                    if "steps" in data:
+                        handler = SimpleRequestHandler._handle_tools_post
+                    elif "input" in data:
+                        handler = SimpleRequestHandler._handle_agent_post
+                if handler is not None:
+                    response_message, response_status = handler(self, data)
+            except ValueError as e:
+                # Covers json.JSONDecodeError, UnicodeDecodeError and
+                # msgspec.DecodeError alike
                 print(f"Failed to parse JSON: {e}")
                 log_to_file(f"Failed to parse JSON: {e}")
                 response_message = "Invalid JSON in request body"
@@ -721,48 +944,138 @@ class SimpleRequestHandler(BaseHTTPRequestHandler):
                 response_status = 500
 
         # Send response
-        self.send_response(response_status)
-        self.send_header("Content-Type", "text/plain")
-        self.end_headers()
-        self.wfile.write(response_message.encode("utf-8"))
+        self._send_bytes(response_status, "text/plain", response_message.encode("utf-8"))
 
     def do_GET(self):
         """Handle GET requests, specifically /api/steps for step status."""
-        if self.path == "/api/steps":
+        # Match on the path component only, so cache-busting query strings
+        # (e.g. /api/steps?ts=...) still hit the right route
+        path = urlsplit(self.path).path
+        if path == "/api/steps":
             try:
-                steps = get_current_steps()
-                response_data = json.dumps(steps, indent=2)
-                
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(response_data.encode("utf-8"))
-                
+                # The pre-serialized bytes are swapped in atomically by
+                # set_agent_state; a plain reference load needs no lock
+                self._send_bytes(200, "application/json", _cached_steps_json)
+
             except Exception as e:
                 error_msg = f"Error getting steps: {str(e)}"
                 print(f"ERROR in GET /api/steps: {e}")
                 log_to_file(f"ERROR in GET /api/steps: {e}")
-                
-                self.send_response(500)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
+
                 error_response = json.dumps({"error": error_msg})
-                self.wfile.write(error_response.encode("utf-8"))
+                self._send_bytes(500, "application/json", error_response.encode("utf-8"))
+        elif path == "/api/events":
+            # Server-Sent Events: push step updates as they happen instead of
+            # making the UI poll /api/steps
+            subscriber = queue.Queue()
+            with _agent_state_lock:
+                _subscribers.append(subscriber)
+            try:
+                # Streaming body has no Content-Length; don't keep-alive it
+                self.close_connection = True
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("X-Accel-Buffering", "no")  # defeat proxy buffering
+                self.end_headers()
+
+                # Send the current snapshot immediately so new clients don't
+                # wait for the next state change
+                self.wfile.write(f"data: {json.dumps(get_current_steps())}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+                while True:
+                    payload = subscriber.get()
+                    if payload is None:
+                        self.wfile.write(b"event: done\ndata: {}\n\n")
+                        self.wfile.flush()
+                        break
+                    self.wfile.write(f"data: {payload}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away
+            finally:
+                with _agent_state_lock:
+                    if subscriber in _subscribers:
+                        _subscribers.remove(subscriber)
         else:
             # Return 404 for other GET requests
-            self.send_response(404)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"Not Found")
+            self._send_bytes(404, "text/plain", b"Not Found")
 
     # Optional: silence default logging to avoid duplicates
     def log_message(self, format, *args):
         return
 
 
+class _Server(ThreadingHTTPServer):
+    """Threaded server tuned for many small requests: daemon workers, a
+    deeper accept backlog, and Nagle disabled for low-latency small writes."""
+    daemon_threads = True
+    request_queue_size = 128
+    allow_reuse_address = True
+    # Set by main() when --workers > 1 so several processes can bind the
+    # same port and the kernel load-balances accepts between them
+    reuse_port = False
+
+    def server_bind(self):
+        if self.reuse_port and hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def _reinit_after_fork():
+    """Rebuild thread-backed machinery in a forked worker process.
+
+    fork() copies the parent's memory but none of its threads, so a child
+    inherits a QueueListener and executors whose worker threads are dead:
+    log records would queue forever with no consumer, and any
+    _EMA_WRITER.submit(...).result() would block forever. Fresh executors,
+    a fresh log queue and a fresh listener restore them for this process;
+    the RotatingFileHandler itself survives fork (logging re-inits handler
+    locks) so it is reused.
+    """
+    global _WORKER_POOL, _EMA_WRITER, _log_queue, _log_listener
+    _WORKER_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agent-worker")
+    _EMA_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ema-writer")
+    _log_queue = queue.Queue(-1)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _file_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def _run_worker(port):
+    """Serve on the shared port from a worker process.
+
+    Each worker lazily builds its own agent/EMA instances; EMA state is
+    shared between processes through the container JSON files on disk.
+    """
+    global global_port
+    global_port = port
+    _Server.reuse_port = True
+    server = _Server((HOST, port), SimpleRequestHandler)
+    server.serve_forever()
+
+
 @click.command()
 @click.option('-p', '--port', default=8080, type=int, help='Port to listen on')
-def main(port):
+@click.option('-w', '--workers', default=1, type=int,
+              help='Number of server processes sharing the port via SO_REUSEPORT. '
+                   'Agent state is per-process, so with more than one worker '
+                   '/api/steps and /api/events may land on a process that did '
+                   'not start the agent; keep the default when using the popup UI.')
+def main(port, workers):
+    if DEBUG:
+        _dump_env_debug()
+    # Create all output directories up front
+    _ensure_startup_dirs()
     # Initialize EMA first
     get_ema()
     # Load showcase patterns if enabled
@@ -770,7 +1083,28 @@ def main(port):
 
     global global_port
     global_port = port
-    server = HTTPServer((HOST, global_port), SimpleRequestHandler)
+
+    # Extra worker processes sidestep the GIL when several agents finish
+    # (and JSON-encode recommendations) at once; showcase patterns were
+    # already loaded by this parent, so children skip that step
+    if workers > 1:
+        if hasattr(socket, "SO_REUSEPORT"):
+            # SO_REUSEPORT load-balances *connections*, but agent state
+            # (current plan, step snapshots, SSE subscribers) lives in
+            # whichever process handled the starting POST — the others
+            # will serve an empty plan for the same run
+            print(f"Warning: --workers {workers} runs {workers} independent processes; "
+                  f"step polling and /api/events only reflect an agent run on the "
+                  f"process that received its POST")
+            _Server.reuse_port = True
+            for _ in range(workers - 1):
+                multiprocessing.Process(target=_run_worker, args=(port,), daemon=True).start()
+        else:
+            print("Warning: SO_REUSEPORT not available; running a single process")
+
+    # The threaded server keeps /api/steps polling responsive while a POST
+    # is blocked on a long-running agent; daemon threads exit with the process
+    server = _Server((HOST, global_port), SimpleRequestHandler)
     print(f"Listening on http://{HOST}:{global_port}")
     try:
         server.serve_forever()